@@ -10,19 +10,110 @@ Usage by Claude:
 - On decisions: log_decision(decision_type, decision, reasoning)
 - On task completion: update_task_status(task_id, 'COMPLETED', verification)
 - At session end: log_session_end()
+
+Message, tool call, decision and intervention logs are written by a background
+thread so callers never wait on Supabase; flush() blocks until they land, and
+close() (also run at interpreter exit) flushes and stops the thread.
+AsyncSessionLogger exposes the same calls as coroutines (requires aiohttp).
 """
 
 import os
 import json
-import requests
+import atexit
+import weakref
+import time
+import queue
+import random
+import logging
+import asyncio
+import threading
+import concurrent.futures
+import orjson
+import urllib3
 from datetime import datetime
 from typing import Optional, List, Dict
 
 # Supabase Configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL", "https://mocerqjnksmhcjzxrewo.supabase.co")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")  # Service role key required
+WRITE_QUEUE_SIZE = 10000  # Pending fire-and-forget log writes
+BATCH_MAX_ROWS = 50       # Max queued records coalesced into one drain pass
+BATCH_WAIT_SECONDS = 0.2  # Max time a record waits for batch-mates
+REQUEST_TIMEOUT = 10      # Seconds before a Supabase call counts as failed
+_OK_POST = frozenset({200, 201})
+_OK_PATCH = frozenset({200, 204})
+# Rejections caused by the rows themselves; auth/permission/missing-table errors
+# (401/403/404) fail the same way for every row, so a batch is not split for them
+_ROW_ERRORS = frozenset({400, 409, 422})
+# Tables with a unique key; inserts skip rows that already exist
+_ON_CONFLICT = {"task_artifacts": "task_id,path"}
+TIME_CACHE_SECONDS = 1.0  # Timestamps within this window share one isoformat()
+OPEN_TASKS_TTL_SECONDS = 5  # How long get_open_tasks may serve a cached result
+FLUSH_TIMEOUT_SECONDS = 10  # Max wait for queued logs on close() and at exit
+
+_log = logging.getLogger(__name__)
+_STOP = object()  # Queue sentinel that ends a writer thread
+_open_loggers = weakref.WeakSet()  # SessionLoggers with a running writer thread
+
+
+def _close_open_loggers():
+    """atexit hook: write out queued logs before the interpreter exits"""
+    for session_logger in list(_open_loggers):
+        session_logger.close()
+
+
+atexit.register(_close_open_loggers)
+
+
+def _json_default(obj):
+    """Float/int subclasses that stdlib json accepted but orjson rejects"""
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _dumps(data) -> bytes:
+    """Encode a request body; numpy scalars (e.g. from predict_batch) pass through"""
+    return orjson.dumps(data, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+# A POST may only be re-sent when the server clearly wrote nothing; GET and
+# PATCH are idempotent and can be retried on any transient failure.
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+_RETRY_STATUS_POST = frozenset({429, 503})
 
-class SessionLogger:
+def _backoff(attempt: int, base: float = 1.0, cap: float = 30.0, jitter: float = 0.5) -> float:
+    """Capped exponential backoff delay with jitter, in seconds"""
+    return min(cap, base * 2 ** attempt) * (1 + random.uniform(0, jitter))
+
+def _with_retry(fn, idempotent: bool = True, max_retries: int = 3):
+    """Call fn() with capped exponential backoff plus jitter.
+    Idempotent requests are retried on connection errors, timeouts, 429 and
+    5xx. Non-idempotent ones (POST) only on connect-phase errors, 429 and 503,
+    so a write the server may already have committed is never sent twice.
+    Any other response (including 4xx) is returned immediately."""
+    retry_exc = urllib3.exceptions.HTTPError if idempotent else urllib3.exceptions.ConnectTimeoutError
+    retry_status = _RETRY_STATUS if idempotent else _RETRY_STATUS_POST
+    for attempt in range(max_retries + 1):
+        try:
+            resp = fn()
+        except retry_exc:  # Connection failures (and timeouts, if idempotent)
+            if attempt == max_retries:
+                raise
+        else:
+            if resp.status not in retry_status or attempt == max_retries:
+                return resp
+        time.sleep(_backoff(attempt))
+
+
+class _SessionLoggerBase:
+    """
+    Session state and Supabase row builders shared by SessionLogger and
+    AsyncSessionLogger. Subclasses only supply the transport (_post/_patch)
+    and decide when each row is sent.
+    """
+    
     def __init__(self, supabase_key: str = None):
         self.key = supabase_key or SUPABASE_KEY
         self.headers = {
@@ -31,66 +122,66 @@ class SessionLogger:
             "Content-Type": "application/json",
             "Prefer": "return=representation"
         }
+        # Log-only writes never read the inserted row back
+        self.headers_minimal = {**self.headers, "Prefer": "return=minimal"}
+        self.headers_ignore_duplicates = {**self.headers, "Prefer": "return=minimal,resolution=ignore-duplicates"}
         self.session_id = None
         self.message_count = 0
         self.tool_call_count = 0
         self.tasks_initiated = 0
         self.tasks_completed = 0
         self.tasks_abandoned = 0
-        self.domains_touched = set()
-        
-    def _post(self, table: str, data: dict) -> dict:
-        """POST to Supabase table"""
-        resp = requests.post(
-            f"{SUPABASE_URL}/rest/v1/{table}",
-            headers=self.headers,
-            json=data
-        )
-        return resp.json() if resp.status_code in [200, 201] else {"error": resp.text}
+        self.domains_touched: Dict[str, None] = {}  # Insertion-ordered set
+        self._open_tasks = None  # (time bucket, rows) last served by get_open_tasks
+        self._cached_now = None
+        self._cached_iso = None
+        self._cached_at = float("-inf")
     
-    def _patch(self, table: str, match: dict, data: dict) -> dict:
-        """PATCH Supabase record"""
-        query = "&".join([f"{k}=eq.{v}" for k, v in match.items()])
-        resp = requests.patch(
-            f"{SUPABASE_URL}/rest/v1/{table}?{query}",
-            headers=self.headers,
-            json=data
-        )
-        return resp.json() if resp.status_code in [200, 204] else {"error": resp.text}
+    def _refresh_time(self) -> str:
+        """UTC ISO timestamp, recomputed at most once per TIME_CACHE_SECONDS"""
+        mono = time.monotonic()
+        if mono - self._cached_at >= TIME_CACHE_SECONDS:
+            self._cached_now = datetime.utcnow()
+            self._cached_iso = self._cached_now.isoformat()
+            self._cached_at = mono
+        return self._cached_iso
     
-    def log_session_start(self, session_id: str = None) -> str:
-        """Start a new chat session"""
+    @staticmethod
+    def _parse(status: int, payload: bytes, ok: frozenset):
+        """Decode a Supabase response body, or wrap the error text"""
+        if status in ok:
+            return orjson.loads(payload) if payload else {}
+        return {"error": payload.decode(errors="replace")}
+    
+    def _session_start_row(self, session_id: str = None) -> dict:
         self.session_id = session_id or f"claude-ai-{datetime.now().strftime('%Y-%m-%d-%H%M')}"
-        result = self._post("chat_sessions", {
+        return {
             "session_id": self.session_id,
-            "started_at": datetime.utcnow().isoformat()
-        })
-        return self.session_id
+            "started_at": self._refresh_time()
+        }
     
-    def log_message(self, role: str, message_type: str, content_summary: str, 
-                    domain: str = None, task_id: str = None, tool_calls: int = 0):
-        """Log a chat message"""
+    def _message_row(self, role: str, message_type: str, content_summary: str,
+                     domain: str = None, task_id: str = None, tool_calls: int = 0) -> dict:
         self.message_count += 1
         self.tool_call_count += tool_calls
         if domain:
-            self.domains_touched.add(domain)
-            
-        return self._post("chat_messages", {
+            self.domains_touched[domain] = None
+        
+        return {
             "session_id": self.session_id,
             "message_number": self.message_count,
             "role": role,
             "message_type": message_type,
-            "content_summary": content_summary[:500],  # Truncate
+            "content_summary": content_summary if len(content_summary) <= 500 else content_summary[:500],  # Truncate
             "domain": domain,
             "task_id": task_id,
             "tool_calls_count": tool_calls
-        })
+        }
     
-    def log_task(self, task_id: str, description: str, domain: str = "BUSINESS",
-                 complexity: int = 5, clarity: int = 5, estimated_minutes: int = 30):
-        """Log a new task"""
+    def _task_row(self, task_id: str, description: str, domain: str = "BUSINESS",
+                  complexity: int = 5, clarity: int = 5, estimated_minutes: int = 30) -> dict:
         self.tasks_initiated += 1
-        return self._post("task_states", {
+        return {
             "session_id": self.session_id,
             "task_id": task_id,
             "description": description,
@@ -99,69 +190,72 @@ class SessionLogger:
             "clarity": clarity,
             "estimated_minutes": estimated_minutes,
             "status": "INITIATED"
-        })
+        }
     
-    def update_task_status(self, task_id: str, status: str, 
-                           verification_status: str = None,
-                           verification_details: str = None,
-                           artifacts: List[str] = None):
-        """Update task status with verification"""
+    def _task_update(self, status: str, verification_status: str = None,
+                     verification_details: str = None) -> dict:
+        now = self._refresh_time()
         update_data = {
             "status": status,
-            "updated_at": datetime.utcnow().isoformat()
+            "updated_at": now
         }
         
         if status == "COMPLETED":
             self.tasks_completed += 1
-            update_data["completed_at"] = datetime.utcnow().isoformat()
+            update_data["completed_at"] = now
         elif status == "ABANDONED":
             self.tasks_abandoned += 1
-            update_data["abandoned_at"] = datetime.utcnow().isoformat()
+            update_data["abandoned_at"] = now
         elif status == "SOLUTION_PROVIDED":
-            update_data["solution_provided_at"] = datetime.utcnow().isoformat()
+            update_data["solution_provided_at"] = now
         elif status == "IN_PROGRESS":
-            update_data["in_progress_at"] = datetime.utcnow().isoformat()
+            update_data["in_progress_at"] = now
             
         if verification_status:
             update_data["verification_status"] = verification_status
         if verification_details:
             update_data["verification_details"] = verification_details
-        if artifacts:
-            update_data["artifacts_created"] = artifacts
-            
-        return self._patch("task_states", {"task_id": task_id}, update_data)
+        return update_data
     
-    def log_tool_call(self, tool_name: str, description: str = None,
-                      success: bool = True, error: str = None,
-                      execution_time_ms: int = None, result_summary: str = None):
-        """Log a tool call"""
-        return self._post("tool_calls", {
+    def _artifact_rows(self, task_id: str, artifacts: List[str]) -> List[dict]:
+        """task_artifacts rows, one per distinct path; the database skips paths already logged"""
+        return [{"task_id": task_id, "path": path} for path in dict.fromkeys(artifacts)]
+    
+    def _post_target(self, table: str, minimal: bool):
+        """(path, headers) for a POST; tables in _ON_CONFLICT skip duplicate rows"""
+        conflict = _ON_CONFLICT.get(table)
+        if conflict:
+            return f"{table}?on_conflict={conflict}", self.headers_ignore_duplicates
+        return table, self.headers_minimal if minimal else None
+    
+    def _tool_call_row(self, tool_name: str, description: str = None,
+                       success: bool = True, error: str = None,
+                       execution_time_ms: int = None, result_summary: str = None) -> dict:
+        return {
             "session_id": self.session_id,
             "tool_name": tool_name,
             "tool_description": description,
             "success": success,
             "error_message": error,
             "execution_time_ms": execution_time_ms,
-            "result_summary": result_summary[:200] if result_summary else None
-        })
+            "result_summary": (result_summary if len(result_summary) <= 200 else result_summary[:200]) if result_summary else None
+        }
     
-    def log_decision(self, decision_type: str, decision: str, reasoning: str = None,
-                     alternatives: List[str] = None, task_id: str = None):
-        """Log a decision"""
-        return self._post("decision_log", {
+    def _decision_row(self, decision_type: str, decision: str, reasoning: str = None,
+                      alternatives: List[str] = None, task_id: str = None) -> dict:
+        return {
             "session_id": self.session_id,
             "task_id": task_id,
             "decision_type": decision_type,
             "decision": decision,
             "reasoning": reasoning,
             "alternatives_considered": alternatives
-        })
+        }
     
-    def log_adhd_intervention(self, task_description: str, risk_level: str,
-                              probability: float, intervention_type: str,
-                              message: str, reasoning: str):
-        """Log an ADHD intervention trigger"""
-        return self._post("task_interventions", {
+    def _intervention_row(self, task_description: str, risk_level: str,
+                          probability: float, intervention_type: str,
+                          message: str, reasoning: str) -> dict:
+        return {
             "user_id": 1,
             "task_description": task_description,
             "intervention_type": intervention_type,
@@ -170,29 +264,37 @@ class SessionLogger:
             "message": message,
             "reasoning": reasoning,
             "intervention_level": 3 if probability > 0.6 else 2 if probability > 0.4 else 1
-        })
+        }
     
-    def log_session_end(self, summary: str = None):
-        """End the session with summary"""
-        return self._patch("chat_sessions", {"session_id": self.session_id}, {
-            "ended_at": datetime.utcnow().isoformat(),
+    def _session_end_update(self, summary: str = None) -> dict:
+        return {
+            "ended_at": self._refresh_time(),
             "total_messages": self.message_count,
             "total_tool_calls": self.tool_call_count,
             "tasks_initiated": self.tasks_initiated,
             "tasks_completed": self.tasks_completed,
             "tasks_abandoned": self.tasks_abandoned,
             "domains_touched": list(self.domains_touched),
-            "primary_domain": list(self.domains_touched)[0] if self.domains_touched else None,
+            "primary_domain": next(iter(self.domains_touched), None),
             "session_summary": summary
-        })
+        }
     
-    def get_open_tasks(self) -> List[dict]:
-        """Get all open tasks"""
-        resp = requests.get(
-            f"{SUPABASE_URL}/rest/v1/v_open_tasks",
-            headers=self.headers
-        )
-        return resp.json() if resp.status_code == 200 else []
+    def _cached_open_tasks(self, bucket: int) -> Optional[List[dict]]:
+        """Copy of the open tasks fetched in this time bucket, or None"""
+        if self._open_tasks is not None and self._open_tasks[0] == bucket:
+            return list(self._open_tasks[1])
+        return None
+    
+    def _store_open_tasks(self, bucket: int, status: int, payload: bytes) -> List[dict]:
+        """Parse a v_open_tasks response; only successful reads are cached"""
+        if status != 200:
+            return []
+        rows = orjson.loads(payload)
+        self._open_tasks = (bucket, tuple(rows))
+        return rows
+    
+    def _invalidate_open_tasks(self):
+        self._open_tasks = None
     
     def get_session_stats(self) -> dict:
         """Get current session statistics"""
@@ -208,6 +310,411 @@ class SessionLogger:
         }
 
 
+class SessionLogger(_SessionLoggerBase):
+    def __init__(self, supabase_key: str = None):
+        super().__init__(supabase_key)
+        self._base = f"{SUPABASE_URL}/rest/v1/"
+        # One connection pool keeps Supabase sockets alive across calls and
+        # carries the auth headers; retries are handled by _with_retry
+        self.http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=16,
+            headers=self.headers,
+            retries=False,
+            timeout=urllib3.Timeout(total=REQUEST_TIMEOUT)
+        )
+        # Log-only writes are drained by a background thread off the hot path;
+        # it starts on the first queued record and stops on close()
+        self._q = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+    
+    def _start_writer(self):
+        """Start the background writer thread if it is not running"""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._drain, daemon=True)
+                self._writer.start()
+                _open_loggers.add(self)
+        
+    def _drain(self):
+        """Background worker: coalesce queued records and bulk-insert per table"""
+        stop = False
+        while not stop:
+            item = self._q.get()
+            if item is _STOP:
+                self._q.task_done()
+                return
+            batch = [item]
+            deadline = time.monotonic() + BATCH_WAIT_SECONDS
+            while len(batch) < BATCH_MAX_ROWS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._q.task_done()
+                    stop = True
+                    break
+                batch.append(item)
+            
+            by_table: Dict[str, List[bytes]] = {}
+            for table, data in batch:
+                by_table.setdefault(table, []).append(data)
+            for table, rows in by_table.items():
+                try:
+                    self._write_rows(table, rows)
+                except Exception:  # A failed log write must never kill the writer thread
+                    _log.exception("Dropped %d %s row(s)", len(rows), table)
+            for _ in batch:
+                self._q.task_done()
+    
+    def _write_rows(self, table: str, rows: List[bytes]):
+        """Bulk-insert queued (pre-encoded) rows. PostgREST inserts a batch atomically,
+        so when the data is rejected the rows are re-sent one at a time and only bad rows are lost."""
+        try:
+            path, headers = self._post_target(table, True)
+            resp = self._request("POST", path, b"[" + b",".join(rows) + b"]", headers)
+        except urllib3.exceptions.HTTPError:
+            _log.warning("Dropped %d %s row(s): Supabase unreachable", len(rows), table, exc_info=True)
+            return
+        if resp.status in _OK_POST:
+            return
+        if len(rows) > 1 and resp.status in _ROW_ERRORS:
+            for row in rows:
+                self._write_rows(table, [row])
+            return
+        _log.warning("Dropped %d %s row(s): HTTP %s %s", len(rows), table, resp.status,
+                     resp.data[:500].decode(errors="replace"))
+    
+    def _enqueue(self, table: str, data: dict) -> Optional[dict]:
+        """Queue a log record; writes inline if the queue is full.
+        The record is encoded here so an unserializable one fails in the caller
+        instead of taking the rest of its batch down in the writer thread."""
+        body = _dumps(data)
+        if self._writer is None:
+            self._start_writer()
+        try:
+            self._q.put_nowait((table, body))
+        except queue.Full:
+            return self._post(table, body, minimal=True)
+        return None
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued log record has been written.
+        Returns False if timeout seconds pass first."""
+        q = self._q
+        if self._writer is None and q.unfinished_tasks:
+            self._start_writer()  # Leftovers from a close() that timed out
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with q.all_tasks_done:
+            while q.unfinished_tasks:
+                if deadline is None:
+                    q.all_tasks_done.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                q.all_tasks_done.wait(remaining)
+        return True
+    
+    def _request(self, method: str, path: str, data=None, headers: dict = None):
+        """Send a JSON request to the Supabase REST API, retrying transient failures.
+        data may be already-encoded bytes. The pool sends self.headers by default;
+        a headers dict replaces them wholesale."""
+        url = self._base + path
+        body = data if data is None or isinstance(data, bytes) else _dumps(data)
+        if headers is None:
+            return _with_retry(lambda: self.http.request(method, url, body=body), method != "POST")
+        return _with_retry(lambda: self.http.request(method, url, body=body, headers=headers), method != "POST")
+    
+    def _post(self, table: str, data, minimal: bool = False) -> dict:
+        """POST a row (or a list of rows) to Supabase table.
+        minimal=True sends Prefer: return=minimal so the rows are not echoed back."""
+        path, headers = self._post_target(table, minimal)
+        resp = self._request("POST", path, data, headers)
+        return self._parse(resp.status, resp.data, _OK_POST)
+    
+    def _patch(self, table: str, match: dict, data: dict) -> dict:
+        """PATCH Supabase record"""
+        query = "&".join([f"{k}=eq.{v}" for k, v in match.items()])
+        resp = self._request("PATCH", f"{table}?{query}", data)
+        return self._parse(resp.status, resp.data, _OK_PATCH)
+    
+    def log_session_start(self, session_id: str = None) -> str:
+        """Start a new chat session"""
+        self._post("chat_sessions", self._session_start_row(session_id))
+        return self.session_id
+    
+    def log_message(self, role: str, message_type: str, content_summary: str, 
+                    domain: str = None, task_id: str = None, tool_calls: int = 0):
+        """Log a chat message"""
+        return self._enqueue("chat_messages", self._message_row(
+            role, message_type, content_summary, domain, task_id, tool_calls))
+    
+    def log_task(self, task_id: str, description: str, domain: str = "BUSINESS",
+                 complexity: int = 5, clarity: int = 5, estimated_minutes: int = 30):
+        """Log a new task"""
+        result = self._post("task_states", self._task_row(
+            task_id, description, domain, complexity, clarity, estimated_minutes))
+        self._invalidate_open_tasks()
+        return result
+    
+    def update_task_status(self, task_id: str, status: str, 
+                           verification_status: str = None,
+                           verification_details: str = None,
+                           artifacts: List[str] = None):
+        """Update task status with verification"""
+        update_data = self._task_update(status, verification_status, verification_details)
+        if artifacts:
+            for row in self._artifact_rows(task_id, artifacts):
+                self._enqueue("task_artifacts", row)
+            
+        result = self._patch("task_states", {"task_id": task_id}, update_data)
+        self._invalidate_open_tasks()
+        return result
+    
+    def log_tool_call(self, tool_name: str, description: str = None,
+                      success: bool = True, error: str = None,
+                      execution_time_ms: int = None, result_summary: str = None):
+        """Log a tool call"""
+        return self._enqueue("tool_calls", self._tool_call_row(
+            tool_name, description, success, error, execution_time_ms, result_summary))
+    
+    def log_decision(self, decision_type: str, decision: str, reasoning: str = None,
+                     alternatives: List[str] = None, task_id: str = None):
+        """Log a decision"""
+        return self._enqueue("decision_log", self._decision_row(
+            decision_type, decision, reasoning, alternatives, task_id))
+    
+    def log_adhd_intervention(self, task_description: str, risk_level: str,
+                              probability: float, intervention_type: str,
+                              message: str, reasoning: str):
+        """Log an ADHD intervention trigger"""
+        return self._enqueue("task_interventions", self._intervention_row(
+            task_description, risk_level, probability, intervention_type, message, reasoning))
+    
+    def close(self, timeout: float = FLUSH_TIMEOUT_SECONDS):
+        """Write out queued logs (waiting at most timeout seconds), stop the
+        writer thread and release pooled HTTP connections. Logging again
+        afterwards starts a new writer."""
+        self.flush(timeout)
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            _open_loggers.discard(self)
+            try:
+                self._q.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass  # Writer is wedged on a full queue; it is a daemon and dies with the process
+            else:
+                writer.join(timeout)
+        self.http.clear()
+    
+    def log_session_end(self, summary: str = None):
+        """End the session with summary"""
+        self.flush(FLUSH_TIMEOUT_SECONDS)
+        result = self._patch("chat_sessions", {"session_id": self.session_id},
+                             self._session_end_update(summary))
+        self.close()
+        return result
+    
+    def get_open_tasks(self) -> List[dict]:
+        """Get all open tasks (cached for up to OPEN_TASKS_TTL_SECONDS)"""
+        bucket = int(time.monotonic() // OPEN_TASKS_TTL_SECONDS)
+        rows = self._cached_open_tasks(bucket)
+        if rows is None:
+            resp = self._request("GET", "v_open_tasks")
+            rows = self._store_open_tasks(bucket, resp.status, resp.data)
+        return rows
+
+
+class AsyncSessionLogger(_SessionLoggerBase):
+    """
+    asyncio variant of SessionLogger backed by aiohttp.
+    Log calls can be awaited concurrently (e.g. with asyncio.gather) so a burst
+    of writes costs roughly one round-trip instead of one per record.
+    Legacy sync callers can hand any coroutine to submit(), which runs it on a
+    private background event loop; close() stops that loop.
+    """
+    
+    def __init__(self, supabase_key: str = None):
+        super().__init__(supabase_key)
+        self._session = None
+        self._session_loop = None  # aiohttp sessions are bound to the loop they were made on
+        self._loop = None
+        self._loop_lock = threading.Lock()
+    
+    async def _client(self):
+        """Create the aiohttp session lazily, inside the running loop.
+        A new session is made whenever the caller runs on a different loop
+        (e.g. a second asyncio.run), since the old one cannot be used there."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            import aiohttp
+            await self._release_session()
+            self._session_loop = loop
+            self._session = aiohttp.ClientSession(
+                base_url=SUPABASE_URL,
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            )
+        return self._session
+    
+    async def _request(self, method: str, path: str, data=None, headers: dict = None):
+        """Send a JSON request to the Supabase REST API; returns (status, body).
+        Retries follow the same policy as _with_retry."""
+        import aiohttp
+        session = await self._client()
+        body = _dumps(data) if data is not None else None
+        idempotent = method != "POST"
+        retry_exc = (aiohttp.ClientError, asyncio.TimeoutError) if idempotent else aiohttp.ClientConnectorError
+        retry_status = _RETRY_STATUS if idempotent else _RETRY_STATUS_POST
+        max_retries = 3
+        for attempt in range(max_retries + 1):
+            try:
+                async with session.request(method, "/rest/v1/" + path, data=body, headers=headers) as resp:
+                    payload = await resp.read()
+            except retry_exc:
+                if attempt == max_retries:
+                    raise
+            else:
+                if resp.status not in retry_status or attempt == max_retries:
+                    return resp.status, payload
+            await asyncio.sleep(_backoff(attempt))
+    
+    async def _post(self, table: str, data, minimal: bool = False) -> dict:
+        """POST a row (or a list of rows) to Supabase table.
+        minimal=True sends Prefer: return=minimal so the rows are not echoed back."""
+        path, headers = self._post_target(table, minimal)
+        status, payload = await self._request("POST", path, data, headers)
+        return self._parse(status, payload, _OK_POST)
+    
+    async def _patch(self, table: str, match: dict, data: dict) -> dict:
+        """PATCH Supabase record"""
+        query = "&".join([f"{k}=eq.{v}" for k, v in match.items()])
+        status, payload = await self._request("PATCH", f"{table}?{query}", data)
+        return self._parse(status, payload, _OK_PATCH)
+    
+    async def log_session_start(self, session_id: str = None) -> str:
+        """Start a new chat session"""
+        await self._post("chat_sessions", self._session_start_row(session_id))
+        return self.session_id
+    
+    async def log_message(self, role: str, message_type: str, content_summary: str,
+                          domain: str = None, task_id: str = None, tool_calls: int = 0):
+        """Log a chat message"""
+        return await self._post("chat_messages", self._message_row(
+            role, message_type, content_summary, domain, task_id, tool_calls), minimal=True)
+    
+    async def log_task(self, task_id: str, description: str, domain: str = "BUSINESS",
+                       complexity: int = 5, clarity: int = 5, estimated_minutes: int = 30):
+        """Log a new task"""
+        result = await self._post("task_states", self._task_row(
+            task_id, description, domain, complexity, clarity, estimated_minutes))
+        self._invalidate_open_tasks()
+        return result
+    
+    async def update_task_status(self, task_id: str, status: str,
+                                 verification_status: str = None,
+                                 verification_details: str = None,
+                                 artifacts: List[str] = None):
+        """Update task status with verification"""
+        update_data = self._task_update(status, verification_status, verification_details)
+        if artifacts:
+            rows = self._artifact_rows(task_id, artifacts)
+            if rows:
+                await self._post("task_artifacts", rows, minimal=True)
+        
+        result = await self._patch("task_states", {"task_id": task_id}, update_data)
+        self._invalidate_open_tasks()
+        return result
+    
+    async def log_tool_call(self, tool_name: str, description: str = None,
+                            success: bool = True, error: str = None,
+                            execution_time_ms: int = None, result_summary: str = None):
+        """Log a tool call"""
+        return await self._post("tool_calls", self._tool_call_row(
+            tool_name, description, success, error, execution_time_ms, result_summary), minimal=True)
+    
+    async def log_decision(self, decision_type: str, decision: str, reasoning: str = None,
+                           alternatives: List[str] = None, task_id: str = None):
+        """Log a decision"""
+        return await self._post("decision_log", self._decision_row(
+            decision_type, decision, reasoning, alternatives, task_id), minimal=True)
+    
+    async def log_adhd_intervention(self, task_description: str, risk_level: str,
+                                    probability: float, intervention_type: str,
+                                    message: str, reasoning: str):
+        """Log an ADHD intervention trigger"""
+        return await self._post("task_interventions", self._intervention_row(
+            task_description, risk_level, probability, intervention_type, message, reasoning),
+            minimal=True)
+    
+    async def _release_session(self):
+        """Close the aiohttp session on the loop that owns it. A session whose
+        loop is no longer running cannot be closed and is just dropped."""
+        session, loop = self._session, self._session_loop
+        self._session = self._session_loop = None
+        if session is None or session.closed:
+            return
+        if loop is asyncio.get_running_loop():
+            await session.close()
+        elif loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+    
+    async def close(self):
+        """Release pooled HTTP connections and stop the submit() loop, if any"""
+        await self._release_session()
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            if asyncio.get_running_loop() is loop:
+                # Awaited via submit(): stop once this coroutine's result is delivered
+                loop.call_soon(loop.stop)
+            else:
+                loop.call_soon_threadsafe(loop.stop)
+    
+    async def log_session_end(self, summary: str = None):
+        """End the session with summary"""
+        result = await self._patch("chat_sessions", {"session_id": self.session_id},
+                                   self._session_end_update(summary))
+        await self.close()
+        return result
+    
+    async def get_open_tasks(self) -> List[dict]:
+        """Get all open tasks (cached for up to OPEN_TASKS_TTL_SECONDS)"""
+        bucket = int(time.monotonic() // OPEN_TASKS_TTL_SECONDS)
+        rows = self._cached_open_tasks(bucket)
+        if rows is None:
+            status, payload = await self._request("GET", "v_open_tasks")
+            rows = self._store_open_tasks(bucket, status, payload)
+        return rows
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Run a coroutine from sync code on the logger's background loop.
+        Returns a concurrent Future; call .result() to block for the response."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._run_loop, args=(self._loop,), daemon=True).start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+    
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop):
+        """Thread target for submit(): run the private loop until close() stops it"""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+
 # Singleton instance for easy import
 logger = SessionLogger()
 
@@ -11,6 +11,81 @@ import xgboost as xgb
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 import json
+import time
+from collections import Counter
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - the kernel below then runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+_IN_PROGRESS_SET = frozenset({'IN_PROGRESS', 'SOLUTION_PROVIDED'})
+
+# One-hot rows for feature columns 10-13 (domain_business .. domain_personal)
+_DOMAIN_ROWS = {
+    'BUSINESS': (1, 0, 0, 0),
+    'MICHAEL': (0, 1, 0, 0),
+    'FAMILY': (0, 0, 1, 0),
+    'PERSONAL': (0, 0, 0, 1),
+}
+_NO_DOMAIN = (0, 0, 0, 0)
+
+# Intervention message templates, rendered with str.format_map
+_MSG_MICRO = "📌 Quick check: {desc} - still on it? Just the next small step."
+_MSG_BODY = "🔄 I notice {desc} from {min} min ago. {switches} context switches today. Let's do this together - what's the ONE next action?"
+_MSG_ACC = "⚠️ ACCOUNTABILITY: {desc} started {min} min ago. Status? Be honest - complete, continue, or consciously defer?"
+_WHY_MICRO = 'Risk at {risk:.0%}, early intervention to maintain momentum'
+_WHY_BODY = 'Risk at {risk:.0%}, mid-session - pattern intervention needed'
+_WHY_ACC = 'Risk at {risk:.0%}, extended duration - requires explicit closure'
+
+# Heuristic risk weights (used when no trained model is loaded)
+_BASE_RISK = 0.3
+_ENERGY_DIP_RISK = 0.15      # 2-4 PM
+_LATE_EVENING_RISK = 0.1     # 9 PM onwards
+_COMPLEXITY_WEIGHT = 0.03    # Per point above 5
+_CLARITY_WEIGHT = 0.02       # Per point above 5
+_ACTIVE_30_RISK = 0.1        # Active > 30 min
+_ACTIVE_60_RISK = 0.15       # Active > 60 min (on top of the 30 min bump)
+_ABANDONED_WEIGHT = 0.1      # Per task abandoned today
+_SWITCH_WEIGHT = 0.05        # Per context switch today
+_COMPLETED_WEIGHT = 0.05     # Per task completed today
+
+
+@njit(cache=True)
+def _heuristic_score_jit(feat):
+    """Heuristic abandonment risk for one extract_features row.
+    Math is done in float64 and in the original order (no fastmath) so scores
+    match the pure-Python heuristic exactly at the 0.4/0.7 thresholds."""
+    hour = float(feat[3])
+    minutes_active = float(feat[5])
+    
+    score = _BASE_RISK
+    # Time-based factors
+    score += _ENERGY_DIP_RISK * (14 <= hour <= 16)
+    score += _LATE_EVENING_RISK * (hour >= 21)
+    # Task factors
+    score += (float(feat[0]) - 5) * _COMPLEXITY_WEIGHT
+    score -= (float(feat[1]) - 5) * _CLARITY_WEIGHT
+    # Duration factor
+    score += _ACTIVE_30_RISK * (minutes_active > 30)
+    score += _ACTIVE_60_RISK * (minutes_active > 60)
+    # Pattern factors
+    score += float(feat[7]) * _ABANDONED_WEIGHT
+    score += float(feat[14]) * _SWITCH_WEIGHT
+    # Momentum factors
+    score -= float(feat[6]) * _COMPLETED_WEIGHT
+    
+    return 0.0 if score < 0.0 else 1.0 if score > 1.0 else score  # Clamp 0-1
+
+
+@njit(cache=True)
+def _heuristic_scores_jit(X):
+    """Heuristic abandonment risk for every row of a feature matrix"""
+    out = np.empty(X.shape[0], dtype=np.float64)
+    for i in range(X.shape[0]):
+        out[i] = _heuristic_score_jit(X[i])
+    return out
 
 class ADHDInterventionModel:
     def __init__(self):
@@ -37,35 +112,89 @@ class ADHDInterventionModel:
             'is_shabbat',               # F-Su considerations
             'consecutive_focus_minutes' # Current focus streak
         ]
+        self._buf = np.empty((1, len(self.feature_names)), dtype=np.float32)
+        self._cached_now = None
+        self._cached_at = float('-inf')
+    
+    @property
+    def booster(self):
+        """Raw Booster of the current model, looked up on use so re-fits are picked up"""
+        return self.model.get_booster() if self.model is not None else None
+    
+    def _inplace_predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict straight from a numpy buffer - no sklearn dispatch, no DMatrix copy.
+        Early-stopped models only use trees up to their best iteration."""
+        best = getattr(self.model, 'best_iteration', None)
+        if best is None:
+            return self.booster.inplace_predict(X)
+        return self.booster.inplace_predict(X, iteration_range=(0, best + 1))
+    
+    def load_model(self, path: str):
+        """Load a saved XGBoost model from disk"""
+        clf = xgb.XGBClassifier()
+        clf.load_model(path)
+        self.model = clf
+    
+    def _refresh_time(self) -> datetime:
+        """Local time, re-read at most once per second across hot calls"""
+        mono = time.monotonic()
+        if mono - self._cached_at >= 1.0:
+            self._cached_now = datetime.now()
+            self._cached_at = mono
+        return self._cached_now
         
-    def extract_features(self, task_data: dict) -> np.array:
-        """Extract features from task data for prediction"""
-        now = datetime.now()
+    def _fill_time_features(self, X: np.ndarray):
+        """Write the clock-derived columns, shared by every row of X"""
+        now = self._refresh_time()
         hour = now.hour
+        weekday = now.weekday()
+        is_peak = 9 <= hour <= 11
+        is_dip = 14 <= hour <= 16
         
-        features = [
-            task_data.get('task_complexity', 5),
-            task_data.get('instruction_clarity', 5),
-            task_data.get('estimated_minutes', 30),
-            hour,
-            now.weekday(),
-            task_data.get('minutes_since_start', 0),
-            task_data.get('tasks_completed_today', 0),
-            task_data.get('tasks_abandoned_today', 0),
-            1 if 9 <= hour <= 11 else 0,  # Peak focus
-            1 if 14 <= hour <= 16 else 0,  # Energy dip
-            1 if task_data.get('domain') == 'BUSINESS' else 0,
-            1 if task_data.get('domain') == 'MICHAEL' else 0,
-            1 if task_data.get('domain') == 'FAMILY' else 0,
-            1 if task_data.get('domain') == 'PERSONAL' else 0,
-            task_data.get('context_switches_today', 0),
-            task_data.get('avg_task_duration_week', 25),
-            task_data.get('completion_rate_week', 0.7),
-            task_data.get('last_break_minutes_ago', 60),
-            1 if now.weekday() >= 4 else 0,  # Fri-Sun
-            task_data.get('consecutive_focus_minutes', 0)
-        ]
-        return np.array(features).reshape(1, -1)
+        X[:, 3] = hour
+        X[:, 4] = weekday
+        X[:, 8] = is_peak    # 9-11 AM
+        X[:, 9] = is_dip     # 2-4 PM
+        X[:, 18] = weekday >= 4      # Fri-Sun
+    
+    def _fill_task_features(self, row: np.ndarray, task_data: dict):
+        """Write the task-derived columns of one feature row"""
+        row[0] = task_data.get('task_complexity', 5)
+        row[1] = task_data.get('instruction_clarity', 5)
+        row[2] = task_data.get('estimated_minutes', 30)
+        row[5] = task_data.get('minutes_since_start', 0)
+        row[6] = task_data.get('tasks_completed_today', 0)
+        row[7] = task_data.get('tasks_abandoned_today', 0)
+        row[10:14] = _DOMAIN_ROWS.get(task_data.get('domain'), _NO_DOMAIN)
+        row[14] = task_data.get('context_switches_today', 0)
+        row[15] = task_data.get('avg_task_duration_week', 25)
+        row[16] = task_data.get('completion_rate_week', 0.7)
+        row[17] = task_data.get('last_break_minutes_ago', 60)
+        row[19] = task_data.get('consecutive_focus_minutes', 0)
+    
+    def extract_features(self, task_data: dict) -> np.array:
+        """Extract features from task data for prediction.
+        Fills a preallocated (1, 20) float32 buffer in place, so the returned
+        array is reused (and overwritten) by the next call."""
+        b = self._buf
+        self._fill_time_features(b)
+        self._fill_task_features(b[0], task_data)
+        return b
+    
+    def extract_features_batch(self, tasks: list) -> np.ndarray:
+        """Extract features for many tasks into a fresh (N, 20) float32 matrix"""
+        X = np.empty((len(tasks), len(self.feature_names)), dtype=np.float32)
+        self._fill_time_features(X)
+        for row, task_data in zip(X, tasks):
+            self._fill_task_features(row, task_data)
+        return X
+    
+    def predict_batch(self, tasks: list) -> np.ndarray:
+        """Abandonment probability for each task, scored in one call"""
+        X = self.extract_features_batch(tasks)
+        if self.model is None:
+            return _heuristic_scores_jit(X)
+        return self._inplace_predict(X)
     
     def predict_abandonment_risk(self, task_data: dict) -> dict:
         """Predict abandonment probability and recommend intervention"""
@@ -73,9 +202,9 @@ class ADHDInterventionModel:
         
         # If no trained model, use heuristic scoring
         if self.model is None:
-            risk_score = self._heuristic_risk_score(task_data)
+            risk_score = self._heuristic_risk_score(task_data, features)
         else:
-            risk_score = self.model.predict_proba(features)[0][1]
+            risk_score = float(self._inplace_predict(features)[0])
         
         # Determine intervention level and type
         intervention = self._get_intervention(risk_score, task_data)
@@ -89,42 +218,12 @@ class ADHDInterventionModel:
             'reasoning': intervention['reasoning']
         }
     
-    def _heuristic_risk_score(self, task_data: dict) -> float:
-        """Calculate risk score using domain knowledge when no model trained"""
-        score = 0.3  # Base risk
-        
-        # Time-based factors
-        hour = datetime.now().hour
-        if 14 <= hour <= 16:  # Energy dip
-            score += 0.15
-        if hour >= 21:  # Late evening
-            score += 0.1
-            
-        # Task factors
-        complexity = task_data.get('task_complexity', 5)
-        clarity = task_data.get('instruction_clarity', 5)
-        score += (complexity - 5) * 0.03
-        score -= (clarity - 5) * 0.02
-        
-        # Duration factor
-        minutes_active = task_data.get('minutes_since_start', 0)
-        if minutes_active > 30:
-            score += 0.1
-        if minutes_active > 60:
-            score += 0.15
-            
-        # Pattern factors
-        abandoned_today = task_data.get('tasks_abandoned_today', 0)
-        score += abandoned_today * 0.1
-        
-        context_switches = task_data.get('context_switches_today', 0)
-        score += context_switches * 0.05
-        
-        # Momentum factors
-        completed_today = task_data.get('tasks_completed_today', 0)
-        score -= completed_today * 0.05
-        
-        return min(max(score, 0), 1)  # Clamp 0-1
+    def _heuristic_risk_score(self, task_data: dict, features: np.ndarray = None) -> float:
+        """Calculate risk score using domain knowledge when no model trained.
+        Pass the array from extract_features to skip rebuilding it."""
+        if features is None:
+            features = self.extract_features(task_data)
+        return float(_heuristic_score_jit(features[0]))
     
     def _get_intervention(self, risk_score: float, task_data: dict) -> dict:
         """Determine appropriate intervention based on risk and context"""
@@ -139,31 +238,37 @@ class ADHDInterventionModel:
                 'reasoning': 'Low abandonment risk - task progressing normally'
             }
         
+        fields = {
+            'desc': task_desc,
+            'min': minutes_active,
+            'switches': task_data.get('context_switches_today', 0),
+            'risk': risk_score
+        }
+        
         if minutes_active < 30:
             # Level 1 - Light check-in
             return {
                 'type': 'MICRO_COMMITMENT',
-                'message': f"📌 Quick check: {task_desc} - still on it? Just the next small step.",
+                'message': _MSG_MICRO.format_map(fields),
                 'action': 'Request status update',
-                'reasoning': f'Risk at {risk_score:.0%}, early intervention to maintain momentum'
+                'reasoning': _WHY_MICRO.format_map(fields)
             }
         
         if minutes_active < 60:
             # Level 2 - Pattern awareness
-            switches = task_data.get('context_switches_today', 0)
             return {
                 'type': 'BODY_DOUBLING',
-                'message': f"🔄 I notice {task_desc} from {minutes_active} min ago. {switches} context switches today. Let's do this together - what's the ONE next action?",
+                'message': _MSG_BODY.format_map(fields),
                 'action': 'Offer body doubling support',
-                'reasoning': f'Risk at {risk_score:.0%}, mid-session - pattern intervention needed'
+                'reasoning': _WHY_BODY.format_map(fields)
             }
         
         # Level 3 - Direct accountability
         return {
             'type': 'ACCOUNTABILITY',
-            'message': f"⚠️ ACCOUNTABILITY: {task_desc} started {minutes_active} min ago. Status? Be honest - complete, continue, or consciously defer?",
+            'message': _MSG_ACC.format_map(fields),
             'action': 'Force decision point',
-            'reasoning': f'Risk at {risk_score:.0%}, extended duration - requires explicit closure'
+            'reasoning': _WHY_ACC.format_map(fields)
         }
 
     def analyze_today_session(self, activities: list) -> dict:
@@ -171,15 +276,17 @@ class ADHDInterventionModel:
         if not activities:
             return {'status': 'No activities logged today'}
         
-        completed = sum(1 for a in activities if a.get('status') == 'COMPLETED')
-        abandoned = sum(1 for a in activities if a.get('status') == 'ABANDONED')
-        in_progress = sum(1 for a in activities if a.get('status') in ['IN_PROGRESS', 'SOLUTION_PROVIDED'])
-        
-        total_focus_minutes = sum(a.get('duration_minutes', 0) for a in activities)
-        domains = {}
+        # Single pass over activities
+        completed = abandoned = in_progress = total_focus_minutes = 0
+        domains = Counter()
         for a in activities:
-            d = a.get('domain', 'UNKNOWN')
-            domains[d] = domains.get(d, 0) + 1
+            get = a.get
+            s = get('status')
+            completed += s == 'COMPLETED'
+            abandoned += s == 'ABANDONED'
+            in_progress += s in _IN_PROGRESS_SET
+            total_focus_minutes += get('duration_minutes', 0)
+            domains[get('domain', 'UNKNOWN')] += 1
         
         # Calculate patterns
         completion_rate = completed / max(completed + abandoned, 1)
@@ -190,7 +297,7 @@ class ADHDInterventionModel:
             'in_progress': in_progress,
             'total_focus_minutes': total_focus_minutes,
             'completion_rate': round(completion_rate, 2),
-            'domains_distribution': domains,
+            'domains_distribution': dict(domains),
             'recommendation': self._session_recommendation(completion_rate, in_progress, abandoned)
         }
     
@@ -213,6 +320,10 @@ def predict_for_task(task_data: dict) -> dict:
     """Main entry point for predictions"""
     return model.predict_abandonment_risk(task_data)
 
+def predict_for_tasks(tasks: list) -> np.ndarray:
+    """Batch entry point - abandonment probabilities for many tasks"""
+    return model.predict_batch(tasks)
+
 def analyze_session(activities: list) -> dict:
     """Analyze full session"""
     return model.analyze_today_session(activities)
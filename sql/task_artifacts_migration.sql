@@ -0,0 +1,58 @@
+-- =====================================================
+-- LIFE OS SESSION LOGGER - TASK ARTIFACTS MIGRATION
+-- Run in Supabase SQL Editor: 
+-- https://supabase.com/dashboard/project/mocerqjnksmhcjzxrewo/sql/new
+-- =====================================================
+-- Purpose: Store task artifacts as one row per file so
+--          re-sent paths are de-duplicated by the database
+-- =====================================================
+
+-- =====================================================
+-- 1. NEW TABLE: TASK_ARTIFACTS
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS task_artifacts (
+    id SERIAL PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMENT ON TABLE task_artifacts IS 'Files created per task - one row per artifact, appended by SessionLogger';
+COMMENT ON COLUMN task_artifacts.task_id IS 'task_states.task_id the artifact belongs to';
+COMMENT ON COLUMN task_artifacts.path IS 'Path or URL of the created artifact';
+
+-- Unique per (task, path): SessionLogger inserts with resolution=ignore-duplicates,
+-- so re-logging a path is a no-op. Also serves lookups by task_id.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_task_artifacts_task_path 
+ON task_artifacts(task_id, path);
+
+-- =====================================================
+-- 2. BACKFILL FROM TASK_STATES
+-- =====================================================
+
+INSERT INTO task_artifacts (task_id, path)
+SELECT task_id, unnest(artifacts_created)
+FROM task_states
+WHERE artifacts_created IS NOT NULL
+ON CONFLICT (task_id, path) DO NOTHING;
+
+-- =====================================================
+-- 3. VIEW FOR READS
+-- =====================================================
+-- One row per task with its artifact list (replaces task_states.artifacts_created)
+
+CREATE OR REPLACE VIEW v_task_artifacts AS
+SELECT 
+    task_id,
+    ARRAY_AGG(path ORDER BY path) as artifacts,
+    COUNT(*) as artifact_count,
+    MAX(created_at) as last_added_at
+FROM task_artifacts
+GROUP BY task_id;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
+-- Test with: SELECT * FROM v_task_artifacts;
+-- =====================================================